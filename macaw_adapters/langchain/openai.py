@@ -18,13 +18,111 @@ Security:
 """
 
 import logging
-from typing import Any, Dict, Iterator, List, Optional
+import threading
+import time
+import weakref
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+try:
+    from langchain_core.messages import AIMessage, AIMessageChunk
+    LANGCHAIN_AVAILABLE = True
+except ImportError:
+    LANGCHAIN_AVAILABLE = False
+
+# SecureOpenAI class, imported on the first ChatOpenAI(). Importing it loads the
+# whole openai SDK, which ChatAnthropic- and tools-only users don't need.
+_secure_openai_cls: Optional[type] = None
+
+
+def _get_secure_openai_cls() -> type:
+    """Import SecureOpenAI once; a missing openai extra raises ImportError here."""
+    global _secure_openai_cls
+    if _secure_openai_cls is None:
+        from macaw_adapters.openai import SecureOpenAI
+        _secure_openai_cls = SecureOpenAI
+    return _secure_openai_cls
+
+# Maximum number of deltas merged into one chunk when stream coalescing is on
+_COALESCE_MAX_CHUNKS = 8
+
+# LangChain message type -> OpenAI role
+_ROLE_MAP = {
+    "human": "user",
+    "ai": "assistant",
+    "system": "system",
+    "function": "function",
+    "tool": "tool"
+}
+
+# Converted LangChain messages keyed on id(msg): (weakref to msg, type, content, dict).
+# Agent loops resend the same message objects every turn; entries are dropped when
+# the message is garbage collected, and ignored if its type/content was reassigned.
+_msg_cache: Dict[int, Tuple[Any, Any, Any, Dict[str, str]]] = {}
+
 # Global registry of ChatOpenAI instances for cleanup
 _instances: List['ChatOpenAI'] = []
 
+# Shared by all hedged invokes; threads are started lazily as calls need them
+_HEDGE_WORKERS = 32
+_hedge_pool = ThreadPoolExecutor(max_workers=_HEDGE_WORKERS, thread_name_prefix="macaw-hedge")
+
+# Free hedge pool workers. Attempts only go to the pool when a worker is free,
+# so requests hung on the network can't queue healthy ones behind them.
+_hedge_slots = threading.BoundedSemaphore(_HEDGE_WORKERS)
+
+
+def _can_hedge(params: Dict[str, Any]) -> bool:
+    """
+    Whether a request may be hedged.
+
+    Requests with tools/functions are not: SecureOpenAI discovers the tool
+    implementations by walking the caller's stack frames, which on a pool
+    thread lead into concurrent.futures instead of user code.
+    """
+    return "tools" not in params and "functions" not in params
+
+
+def _submit_attempt(create: Callable[..., Any], params: Dict[str, Any]) -> Optional[Future]:
+    """Run create(**params) on the hedge pool, or return None if no worker is free."""
+    if not _hedge_slots.acquire(blocking=False):
+        return None
+    future = _hedge_pool.submit(create, **params)
+    future.add_done_callback(lambda _: _hedge_slots.release())
+    return future
+
+
+def _hedged_call(create: Callable[..., Any], params: Dict[str, Any], hedge_ms: float) -> Any:
+    """
+    Call create(**params); if it has not returned after hedge_ms, fire a
+    second identical request and return whichever finishes first.
+
+    With the pool saturated the call degrades to an unhedged one: it runs on
+    the caller's thread, or waits on the first attempt alone.
+    """
+    first = _submit_attempt(create, params)
+    if first is None:
+        return create(**params)
+    done, _ = wait([first], timeout=hedge_ms / 1000)
+    if done:
+        return first.result()
+
+    second = _submit_attempt(create, params)
+    if second is None:
+        logger.debug(f"[ChatOpenAI] No response after {hedge_ms}ms, hedge pool busy")
+        return first.result()
+    logger.debug(f"[ChatOpenAI] No response after {hedge_ms}ms, sending hedge request")
+    done, pending = wait([first, second], return_when=FIRST_COMPLETED)
+    winner = done.pop()
+    if winner.exception() is not None and pending:
+        # Fastest attempt failed - fall back to the one still running
+        return pending.pop().result()
+    for future in pending:
+        future.cancel()
+    return winner.result()
+
 
 class ChatOpenAI:
     """
@@ -36,6 +134,14 @@ class ChatOpenAI:
     MACAW is completely invisible - use exactly like native LangChain.
     """
 
+    # No per-instance __dict__: bind() clones can be kept alive by the thousands
+    __slots__ = (
+        "model_name", "temperature", "max_tokens", "_kwargs",
+        "_stream_coalesce_ms", "_hedge_ms",
+        "_base_url", "_organization", "_timeout", "_max_retries",
+        "_secure_openai", "__weakref__",
+    )
+
     def __init__(
         self,
         model: str = "gpt-4",
@@ -46,6 +152,8 @@ class ChatOpenAI:
         organization: Optional[str] = None,
         timeout: Optional[float] = None,
         max_retries: int = 2,
+        stream_coalesce_ms: float = 0.0,
+        hedge_ms: Optional[float] = None,
         **kwargs
     ):
         """
@@ -60,6 +168,13 @@ class ChatOpenAI:
             organization: OpenAI organization ID
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
+            stream_coalesce_ms: Merge streamed deltas arriving within this window
+                (up to 8 per chunk) into one AIMessageChunk. The first token is
+                always yielded immediately. 0 disables coalescing.
+            hedge_ms: If invoke() has not returned after this many milliseconds,
+                send a second identical request and use whichever finishes
+                first. Trades extra LLM/PEP calls for lower tail latency.
+                Calls passing tools/functions are never hedged.
             **kwargs: Additional arguments
         """
         # Store configuration
@@ -67,8 +182,11 @@ class ChatOpenAI:
         self.temperature = temperature
         self.max_tokens = max_tokens
         self._kwargs = kwargs
+        self._stream_coalesce_ms = stream_coalesce_ms
+        self._hedge_ms = hedge_ms
 
-        # Store optional config for reference (not passed to SecureOpenAI)
+        # Store optional config for reference (not passed to SecureOpenAI;
+        # timeout is forwarded per request)
         self._base_url = base_url
         self._organization = organization
         self._timeout = timeout
@@ -76,8 +194,12 @@ class ChatOpenAI:
 
         # Create SecureOpenAI internally - it handles its own MACAWClient
         # SecureOpenAI accepts: api_key, app_name, intent_policy
-        from macaw_adapters.openai import SecureOpenAI
+        SecureOpenAI = _get_secure_openai_cls()
 
+        # Deliberately one SecureOpenAI per instance, not shared per credentials:
+        # it keeps tool-discovery state (user_tools, _discovered_tools,
+        # _tools_registered), so a shared backend would only ever register the
+        # first instance's tools
         self._secure_openai = SecureOpenAI(
             app_name="langchain-openai",
             api_key=api_key
@@ -96,17 +218,25 @@ class ChatOpenAI:
         if isinstance(input_data, list):
             messages = []
             for msg in input_data:
-                if hasattr(msg, 'type') and hasattr(msg, 'content'):
+                msg_type = getattr(msg, 'type', None)
+                content = getattr(msg, 'content', None)
+                if msg_type is not None and content is not None:
                     # LangChain message object (HumanMessage, AIMessage, etc.)
-                    role_map = {
-                        "human": "user",
-                        "ai": "assistant",
-                        "system": "system",
-                        "function": "function",
-                        "tool": "tool"
-                    }
-                    role = role_map.get(msg.type, "user")
-                    messages.append({"role": role, "content": str(msg.content)})
+                    key = id(msg)
+                    cached = _msg_cache.get(key)
+                    if (cached is not None and cached[0]() is msg
+                            and cached[1] is msg_type and cached[2] is content):
+                        messages.append(cached[3])
+                        continue
+
+                    converted = {"role": _ROLE_MAP.get(msg_type, "user"), "content": str(content)}
+                    messages.append(converted)
+                    try:
+                        ref = weakref.ref(msg, lambda _, key=key: _msg_cache.pop(key, None))
+                    except TypeError:
+                        # Not weak-referenceable; can't track its lifetime, so don't cache
+                        continue
+                    _msg_cache[key] = (ref, msg_type, content, converted)
                 elif isinstance(msg, dict):
                     # Already in dict format
                     messages.append(msg)
@@ -120,54 +250,101 @@ class ChatOpenAI:
 
     def _to_langchain_message(self, openai_response: Any) -> Any:
         """Convert OpenAI ChatCompletion to LangChain AIMessage."""
-        try:
-            from langchain_core.messages import AIMessage
-
-            # Handle dict response
-            if isinstance(openai_response, dict):
-                choices = openai_response.get("choices", [])
-                if choices:
-                    content = choices[0].get("message", {}).get("content", "")
-                    return AIMessage(content=content)
-                return AIMessage(content="")
-
-            # Handle ChatCompletion object
-            if hasattr(openai_response, 'choices') and openai_response.choices:
-                content = openai_response.choices[0].message.content or ""
+        if not LANGCHAIN_AVAILABLE:
+            # langchain_core not available, return raw response
+            logger.warning("langchain_core not installed, returning raw response")
+            return openai_response
+
+        # Handle dict response
+        if isinstance(openai_response, dict):
+            choices = openai_response.get("choices", [])
+            if choices:
+                content = choices[0].get("message", {}).get("content", "")
                 return AIMessage(content=content)
+            return AIMessage(content="")
+
+        # Handle ChatCompletion object
+        choices = getattr(openai_response, 'choices', None)
+        if choices:
+            content = choices[0].message.content or ""
+            return AIMessage(content=content)
 
-            return AIMessage(content=str(openai_response))
+        return AIMessage(content=str(openai_response))
 
-        except ImportError:
+    def _to_langchain_messages(self, openai_response: Any) -> List[Any]:
+        """Convert every choice of an OpenAI ChatCompletion (n > 1) to AIMessages."""
+        if not LANGCHAIN_AVAILABLE:
             # langchain_core not available, return raw response
             logger.warning("langchain_core not installed, returning raw response")
-            return openai_response
+            return [openai_response]
+
+        # Handle dict response
+        if isinstance(openai_response, dict):
+            return [
+                AIMessage(content=c.get("message", {}).get("content", "") or "")
+                for c in openai_response.get("choices", [])
+            ]
+
+        # Handle ChatCompletion object
+        return [AIMessage(content=c.message.content or "") for c in openai_response.choices]
 
     def _to_langchain_chunk(self, openai_chunk: Any) -> Any:
         """Convert OpenAI streaming chunk to LangChain AIMessageChunk."""
-        try:
-            from langchain_core.messages import AIMessageChunk
-
-            # Handle dict chunk
-            if isinstance(openai_chunk, dict):
-                choices = openai_chunk.get("choices", [])
-                if choices:
-                    delta = choices[0].get("delta", {})
-                    content = delta.get("content", "")
-                    return AIMessageChunk(content=content)
-                return AIMessageChunk(content="")
-
-            # Handle ChatCompletionChunk object
-            if hasattr(openai_chunk, 'choices') and openai_chunk.choices:
-                delta = openai_chunk.choices[0].delta
-                content = delta.content if delta and delta.content else ""
-                return AIMessageChunk(content=content)
+        if not LANGCHAIN_AVAILABLE:
+            # Return raw chunk
+            return openai_chunk
 
+        # Handle dict chunk
+        if isinstance(openai_chunk, dict):
+            choices = openai_chunk.get("choices", [])
+            if choices:
+                delta = choices[0].get("delta", {})
+                content = delta.get("content", "")
+                return AIMessageChunk(content=content)
             return AIMessageChunk(content="")
 
-        except ImportError:
-            # Return raw chunk
-            return openai_chunk
+        # Handle ChatCompletionChunk object
+        choices = getattr(openai_chunk, 'choices', None)
+        if choices:
+            delta = choices[0].delta
+            content = delta.content if delta and delta.content else ""
+            return AIMessageChunk(content=content)
+
+        return AIMessageChunk(content="")
+
+    def _coalesce_chunks(self, chunks: Iterator) -> Iterator:
+        """Merge consecutive AIMessageChunks per stream_coalesce_ms window."""
+        if self._stream_coalesce_ms <= 0 or not LANGCHAIN_AVAILABLE:
+            # Disabled, or raw chunks that cannot be merged
+            yield from chunks
+            return
+
+        window = self._stream_coalesce_ms / 1000
+        buf: List[str] = []
+        deadline = None
+        for chunk in chunks:
+            if not chunk.content:
+                # Role-only / finish chunks carry no text: pass them through
+                # (after any buffered text, to keep order) without using up
+                # the first-token slot
+                if buf:
+                    yield AIMessageChunk(content="".join(buf))
+                    buf = []
+                    deadline = time.monotonic() + window
+                yield chunk
+                continue
+            if deadline is None:
+                # First token always flushes immediately (time to first token)
+                deadline = time.monotonic() + window
+                yield chunk
+                continue
+            buf.append(chunk.content)
+            if len(buf) >= _COALESCE_MAX_CHUNKS or time.monotonic() >= deadline:
+                yield AIMessageChunk(content="".join(buf))
+                buf = []
+                deadline = time.monotonic() + window
+        if buf:
+            yield AIMessageChunk(content="".join(buf))
 
     def invoke(self, input: Any, config: Optional[Dict] = None, **kwargs) -> Any:
         """
@@ -193,11 +370,18 @@ class ChatOpenAI:
         if self.max_tokens:
             params["max_tokens"] = self.max_tokens
 
+        if self._timeout is not None:
+            params["timeout"] = self._timeout
+
         # Merge additional kwargs
         params.update(kwargs)
 
         # Call SecureOpenAI (routes through PEP!)
-        response = self._secure_openai.chat.completions.create(**params)
+        create = self._secure_openai.chat.completions.create
+        if self._hedge_ms and _can_hedge(params):
+            response = _hedged_call(create, params, self._hedge_ms)
+        else:
+            response = create(**params)
 
         # Convert to LangChain format
         return self._to_langchain_message(response)
@@ -226,12 +410,15 @@ class ChatOpenAI:
         }
         if self.max_tokens:
             params["max_tokens"] = self.max_tokens
+        if self._timeout is not None:
+            params["timeout"] = self._timeout
 
         params.update(kwargs)
 
         # Stream from SecureOpenAI (routes through PEP!)
-        for chunk in self._secure_openai.chat.completions.create(**params):
-            yield self._to_langchain_chunk(chunk)
+        stream = self._secure_openai.chat.completions.create(**params)
+        chunks = map(self._to_langchain_chunk, stream)
+        yield from self._coalesce_chunks(chunks)
 
     def batch(self, inputs: List[Any], config: Optional[Dict] = None, **kwargs) -> List:
         """
@@ -245,6 +432,27 @@ class ChatOpenAI:
         Returns:
             List of LLM responses (AIMessage)
         """
+        # Identical prompts: one PEP-routed request with n=len(inputs) instead of N
+        if len(inputs) > 1 and "n" not in kwargs:
+            messages = self._to_openai_messages(inputs[0])
+            if all(self._to_openai_messages(i) == messages for i in inputs[1:]):
+                params = {
+                    "model": self.model_name,
+                    "messages": messages,
+                    "temperature": self.temperature,
+                    "n": len(inputs),
+                }
+                if self.max_tokens:
+                    params["max_tokens"] = self.max_tokens
+                if self._timeout is not None:
+                    params["timeout"] = self._timeout
+                params.update(kwargs)
+
+                response = self._secure_openai.chat.completions.create(**params)
+                results = self._to_langchain_messages(response)
+                if len(results) == len(inputs):
+                    return results
+
         # Process each input through invoke (each goes through PEP)
         return [self.invoke(input, config=config, **kwargs) for input in inputs]
 
@@ -287,7 +495,14 @@ class ChatOpenAI:
     def bind(self, **kwargs):
         """Bind arguments to the LLM (LangChain compatibility)."""
         # Create a new instance with merged kwargs
-        new_kwargs = {**self._kwargs, **kwargs}
+        new_kwargs = {
+            "timeout": self._timeout,
+            "max_retries": self._max_retries,
+            "stream_coalesce_ms": self._stream_coalesce_ms,
+            "hedge_ms": self._hedge_ms,
+            **self._kwargs,
+            **kwargs,
+        }
         return ChatOpenAI(
             model=self.model_name,
             temperature=self.temperature,
@@ -317,6 +532,12 @@ class BoundChatOpenAI:
     Routes all calls through the user's identity for per-user policy enforcement.
     """
 
+    __slots__ = (
+        "_parent", "_user_client", "_bound_openai",
+        "_to_openai_messages", "_to_langchain_message", "_to_langchain_messages",
+        "_to_langchain_chunk", "_coalesce_chunks", "__weakref__",
+    )
+
     def __init__(self, parent: ChatOpenAI, user_client: 'MACAWClient'):
         self._parent = parent
         self._user_client = user_client
@@ -324,17 +545,12 @@ class BoundChatOpenAI:
         # Get bound SecureOpenAI for this user
         self._bound_openai = parent._secure_openai.bind_to_user(user_client)
 
-    def _to_openai_messages(self, input_data: Any) -> List[Dict[str, str]]:
-        """Delegate to parent's conversion."""
-        return self._parent._to_openai_messages(input_data)
-
-    def _to_langchain_message(self, openai_response: Any) -> Any:
-        """Delegate to parent's conversion."""
-        return self._parent._to_langchain_message(openai_response)
-
-    def _to_langchain_chunk(self, openai_chunk: Any) -> Any:
-        """Delegate to parent's conversion."""
-        return self._parent._to_langchain_chunk(openai_chunk)
+        # Use parent's conversions directly (bound once, not per call/chunk)
+        self._to_openai_messages = parent._to_openai_messages
+        self._to_langchain_message = parent._to_langchain_message
+        self._to_langchain_messages = parent._to_langchain_messages
+        self._to_langchain_chunk = parent._to_langchain_chunk
+        self._coalesce_chunks = parent._coalesce_chunks
 
     def invoke(self, input: Any, config: Optional[Dict] = None, **kwargs) -> Any:
         """Invoke with user identity."""
@@ -347,10 +563,16 @@ class BoundChatOpenAI:
         }
         if self._parent.max_tokens:
             params["max_tokens"] = self._parent.max_tokens
+        if self._parent._timeout is not None:
+            params["timeout"] = self._parent._timeout
         params.update(kwargs)
 
         # Call through bound SecureOpenAI (user identity!)
-        response = self._bound_openai.chat.completions.create(**params)
+        create = self._bound_openai.chat.completions.create
+        if self._parent._hedge_ms and _can_hedge(params):
+            response = _hedged_call(create, params, self._parent._hedge_ms)
+        else:
+            response = create(**params)
         return self._to_langchain_message(response)
 
     def stream(self, input: Any, config: Optional[Dict] = None, **kwargs) -> Iterator:
@@ -365,13 +587,36 @@ class BoundChatOpenAI:
         }
         if self._parent.max_tokens:
             params["max_tokens"] = self._parent.max_tokens
+        if self._parent._timeout is not None:
+            params["timeout"] = self._parent._timeout
         params.update(kwargs)
 
-        for chunk in self._bound_openai.chat.completions.create(**params):
-            yield self._to_langchain_chunk(chunk)
+        chunks = map(self._to_langchain_chunk, self._bound_openai.chat.completions.create(**params))
+        yield from self._coalesce_chunks(chunks)
 
     def batch(self, inputs: List[Any], config: Optional[Dict] = None, **kwargs) -> List:
         """Batch with user identity."""
+        # Identical prompts: one request with n=len(inputs) instead of N
+        if len(inputs) > 1 and "n" not in kwargs:
+            messages = self._to_openai_messages(inputs[0])
+            if all(self._to_openai_messages(i) == messages for i in inputs[1:]):
+                params = {
+                    "model": self._parent.model_name,
+                    "messages": messages,
+                    "temperature": self._parent.temperature,
+                    "n": len(inputs),
+                }
+                if self._parent.max_tokens:
+                    params["max_tokens"] = self._parent.max_tokens
+                if self._parent._timeout is not None:
+                    params["timeout"] = self._parent._timeout
+                params.update(kwargs)
+
+                response = self._bound_openai.chat.completions.create(**params)
+                results = self._to_langchain_messages(response)
+                if len(results) == len(inputs):
+                    return results
+
         return [self.invoke(input, config=config, **kwargs) for input in inputs]
 
     async def ainvoke(self, input: Any, config: Optional[Dict] = None, **kwargs) -> Any:
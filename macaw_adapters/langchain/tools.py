@@ -11,8 +11,12 @@ Usage:
     secure_tools = wrap_tools(tools, macaw_client)
 """
 
+import hashlib
+import json
 import logging
-from typing import Any, List, Optional
+import re
+import time
+from typing import Any, Dict, List, Optional, Tuple
 
 from langchain_core.tools import BaseTool
 from langchain_core.callbacks import CallbackManagerForToolRun, AsyncCallbackManagerForToolRun
@@ -20,6 +24,65 @@ from macaw_client import MACAWClient
 
 logger = logging.getLogger(__name__)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Error text that indicates the PEP refused the call
+_DENY_RE = re.compile(r"denied|blocked|policy", re.IGNORECASE)
+
+# PEP denials keyed on (tool_name, canonical_params, agent) -> expiry. Only
+# definitive denials (PermissionError from invoke_tool) are cached; allowed calls
+# still go through invoke_tool so the tool executes and the call is audited.
+# There is no policy version to key on, so a policy change that grants access
+# takes effect for a cached call once its entry expires (_DECISION_TTL).
+_DECISION_TTL = 30.0
+_DECISION_CACHE_SIZE = 4096
+_denied_decisions: Dict[Tuple[str, str, Any], float] = {}
+
+
+def _canonical_params(parameters: Dict[str, Any]) -> Optional[str]:
+    """
+    Stable hash of tool parameters for decision-cache keys.
+
+    Returns None for parameters neither encoder can serialize (orjson rejects
+    non-str keys and ints beyond 64 bits; sort_keys rejects mixed key types);
+    such calls bypass the denial cache.
+    """
+    encoded = None
+    if ORJSON_AVAILABLE:
+        try:
+            encoded = orjson.dumps(parameters, option=orjson.OPT_SORT_KEYS, default=str)
+        except TypeError:
+            pass
+    if encoded is None:
+        try:
+            encoded = json.dumps(parameters, sort_keys=True, default=str).encode()
+        except (TypeError, ValueError):
+            return None
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def _cached_denial(key: Tuple[str, str, Any]) -> bool:
+    """Check whether the PEP recently denied this exact call."""
+    expiry = _denied_decisions.get(key)
+    if expiry is None:
+        return False
+    if expiry < time.monotonic():
+        _denied_decisions.pop(key, None)
+        return False
+    return True
+
+
+def _record_denial(key: Tuple[str, str, Any]) -> None:
+    """Remember a PEP denial for _DECISION_TTL seconds."""
+    if len(_denied_decisions) >= _DECISION_CACHE_SIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _denied_decisions.pop(next(iter(_denied_decisions)), None)
+    _denied_decisions[key] = time.monotonic() + _DECISION_TTL
+
 
 class SecureToolWrapper(BaseTool):
     """
@@ -83,22 +146,42 @@ class SecureToolWrapper(BaseTool):
         mapl_name = f"tool:{app_name}/{self.name}"
         logger.debug(f"[SecureTool] Routing {self.name} -> {mapl_name} through MACAW")
 
-        try:
-            # Build parameters dict
-            parameters = {"input": tool_input}
+        # Build parameters dict
+        parameters = {"input": tool_input}
+        agent_id = self.macaw_client.agent_id
+        params_hash = _canonical_params(parameters)
+        decision_key = (mapl_name, params_hash, agent_id) if params_hash else None
+        if decision_key and _cached_denial(decision_key):
+            logger.debug(f"[SecureTool] Cached denial for {mapl_name}")
+            return f"Access denied by security policy: {mapl_name}"
+
+        # Best-effort: prefer a fused policy-check + execute call (one RPC) when
+        # the client provides one; otherwise fall back to invoke_tool()
+        invoke = (
+            getattr(self.macaw_client, 'invoke_tool_fused', None) or self.macaw_client.invoke_tool
+        )
 
+        try:
             # Invoke tool through MACAW protocol with MAPL-compliant name
             # Authenticated prompts are auto-created by invoke_tool() based on registry
-            result = self.macaw_client.invoke_tool(
+            result = invoke(
                 tool_name=mapl_name,
                 parameters=parameters,
-                target_agent=self.macaw_client.agent_id
+                target_agent=agent_id
             )
             return str(result) if result is not None else ""
 
+        except PermissionError as e:
+            # invoke_tool's documented policy denial: safe to remember
+            logger.warning(f"MACAW blocked {mapl_name}: {e}")
+            if decision_key:
+                _record_denial(decision_key)
+            return f"Access denied by security policy: {mapl_name}"
+
         except Exception as e:
-            error_msg = str(e).lower()
-            if any(word in error_msg for word in ['denied', 'blocked', 'policy']):
+            # Denial-looking text may also be a transient PEP or tool error,
+            # so report it for this call only
+            if _DENY_RE.search(str(e)):
                 logger.warning(f"MACAW blocked {mapl_name}: {e}")
                 return f"Access denied by security policy: {mapl_name}"
             raise
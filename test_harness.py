@@ -16,21 +16,66 @@ Options:
     --openai-key      OpenAI API key for OpenAI/LangChain examples
     --anthropic-key   Anthropic API key for Anthropic/LangChain examples
     --install-local   Install macaw-adapters from local dist/ instead of PyPI
+    --jobs N          Run up to N tests in parallel (default: CPU count - 2)
+    --clean           Re-extract the SDK, rebuild the cached venv and bypass pip's cache
     --verbose         Show full output from each test
 """
 
 import os
+import re
 import sys
+import shutil
+import hashlib
+import fnmatch
 import subprocess
+import venv
 import zipfile
 import time
 import signal
+import statistics
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Optional, List, Dict
+from typing import Any, Optional, List, Dict, NamedTuple, Tuple
 from enum import Enum
 
+try:
+    from packaging.tags import sys_tags
+    from packaging.utils import InvalidWheelFilename, parse_wheel_filename
+except ImportError:
+    # packaging isn't always installed; pip vendors it
+    from pip._vendor.packaging.tags import sys_tags
+    from pip._vendor.packaging.utils import InvalidWheelFilename, parse_wheel_filename
+
+# Output lines that mean an MCP server has registered and is serving
+SERVER_READY_RE = re.compile(
+    rb"Registered as agent|SecureMCP server '[^']*' started|Uvicorn running on|Server running"
+)
+# Bytes of a failing test's stdout/stderr kept for the report
+OUTPUT_TAIL_BYTES = 8192
+
+# Prepared venvs are cached here across harness runs
+CACHE_DIR = Path.home() / ".cache" / "macaw-harness"
+
+# Longest wait for a ready line; a server still alive after this is assumed ready
+SERVER_READY_TIMEOUT = 10.0
+
+# Budget for `python -c "import macaw_adapters.<category>"` (cold imports of
+# the provider SDKs can take several seconds)
+IMPORT_PROBE_TIMEOUT = 30
+
+# Popen kwargs that put a server in its own process group so it can be torn
+# down as a whole. start_new_session avoids preexec_fn, which is unsafe with
+# threads and forces fork() instead of posix_spawn.
+if os.name == "nt":
+    NEW_PROCESS_GROUP = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    NEW_PROCESS_GROUP = {"start_new_session": True}
+
 
 class TestResult(Enum):
     PASS = "PASS"
@@ -46,11 +91,185 @@ class TestCase:
     category: str
     requires_server: Optional[Path] = None
     requires_keys: List[str] = field(default_factory=list)
+    app_names: List[str] = field(default_factory=list)
     timeout: int = 60
     result: TestResult = TestResult.SKIP
     output: str = ""
     error: str = ""
     duration: float = 0
+    log: List[str] = field(default_factory=list)
+
+
+class TestConfig(NamedTuple):
+    """Static description of one example script the harness knows how to run."""
+    script: str  # relative to examples/, e.g. "mcp/1a_simple_invocation.py"
+    requires_keys: Tuple[str, ...] = ()
+    requires_server: Optional[str] = None
+    app_names: Tuple[str, ...] = ()  # MACAW app names the script registers
+    timeout: int = 60
+
+
+TEST_CONFIGS: Tuple[TestConfig, ...] = (
+    # OpenAI examples
+    TestConfig(
+        "openai/openai_1a_dropin_simple.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("my-simple-app",),
+    ),
+    TestConfig(
+        "openai/openai_1b_multiuser_bind.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("financial-app", "openai-service"),
+    ),
+    TestConfig(
+        "openai/openai_1b_multiuser_bind_streaming.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("financial-app", "openai-service"),
+    ),
+    TestConfig(
+        "openai/openai_1c_a2a_invoke.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("openai-service", "my-agent"),
+    ),
+    # Anthropic examples
+    TestConfig(
+        "anthropic/anthropic_1a_dropin_simple.py",
+        requires_keys=("ANTHROPIC_API_KEY",),
+        app_names=("my-simple-app",),
+    ),
+    TestConfig(
+        "anthropic/anthropic_1b_multiuser_bind.py",
+        requires_keys=("ANTHROPIC_API_KEY",),
+        app_names=("financial-app", "anthropic-service"),
+    ),
+    TestConfig(
+        "anthropic/anthropic_1b_multiuser_bind_streaming.py",
+        requires_keys=("ANTHROPIC_API_KEY",),
+        app_names=("financial-app", "anthropic-service"),
+    ),
+    TestConfig(
+        "anthropic/anthropic_1c_a2a_invoke.py",
+        requires_keys=("ANTHROPIC_API_KEY",),
+        app_names=("anthropic-service", "my-agent"),
+    ),
+    # LangChain examples - app names come from the adapters: create_react_agent
+    # registers "secure-langchain-agent" (the 1a-1c scripts pass langchain_openai's
+    # own ChatOpenAI), ChatOpenAI "langchain-openai", ChatAnthropic
+    # "langchain-anthropic" and the memory classes "langchain-memory"
+    TestConfig(
+        "langchain/langchain_1a_dropin_simple.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("secure-langchain-agent",),
+    ),
+    TestConfig(
+        "langchain/langchain_1b_multiuser.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("secure-langchain-agent",),
+    ),
+    TestConfig(
+        "langchain/langchain_1c_orchestration.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("secure-langchain-agent",),
+    ),
+    TestConfig(
+        "langchain/langchain_1d_llm_openai.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("langchain-openai",),
+    ),
+    TestConfig(
+        "langchain/langchain_1e_llm_anthropic.py",
+        requires_keys=("ANTHROPIC_API_KEY",),
+        app_names=("langchain-anthropic",),
+    ),
+    TestConfig(
+        "langchain/langchain_1f_memory.py",
+        requires_keys=("OPENAI_API_KEY",),
+        app_names=("langchain-memory", "langchain-openai"),
+    ),
+    # MCP examples - server/client pairs
+    TestConfig(
+        "mcp/1a_simple_invocation.py",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=90,
+    ),
+    TestConfig(
+        "mcp/1b_discovery_and_resources.py",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=90,
+    ),
+    TestConfig(
+        "mcp/1c_logging_client.py",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=90,
+    ),
+    TestConfig(
+        "mcp/1d_progress_client.py",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=90,
+    ),
+    TestConfig(
+        "mcp/1e_sampling_client.py",
+        requires_server="mcp/1e_sampling_server.py",
+        timeout=90,
+    ),
+    TestConfig(
+        "mcp/1f_elicitation_client.py",
+        requires_server="mcp/1f_elicitation_server.py",
+        timeout=90,
+    ),
+    TestConfig(
+        "mcp/1g_roots_client.py",
+        requires_server="mcp/1g_roots_server.py",
+        timeout=90,
+    ),
+)
+
+
+def file_sha256(path: Path) -> str:
+    """SHA-256 of a file, streamed so large files aren't read into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_zip(zip_path: Path, dest: Path, jobs: int):
+    """
+    Extract a zip archive using a pool of threads.
+
+    zlib inflate releases the GIL, so members extract in parallel. Each worker
+    opens its own ZipFile; a shared handle would serialize every read.
+    """
+    local = threading.local()
+    handles: List[zipfile.ZipFile] = []
+    handles_lock = threading.Lock()
+
+    def extract(info: zipfile.ZipInfo):
+        if not hasattr(local, "zf"):
+            local.zf = zipfile.ZipFile(zip_path)
+            with handles_lock:
+                handles.append(local.zf)
+        try:
+            local.zf.extract(info, dest)
+        except FileExistsError:
+            # Another worker created the same parent directory first
+            local.zf.extract(info, dest)
+
+    with zipfile.ZipFile(zip_path) as zf:
+        members = zf.infolist()
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # list() re-raises the first extraction error
+            list(pool.map(extract, members))
+    finally:
+        for handle in handles:
+            handle.close()
+
+
+def default_jobs() -> int:
+    """Default worker count: leave two CPUs for the servers and tests themselves."""
+    return max(1, (os.cpu_count() or 1) - 2)
 
 
 class TestHarness:
@@ -62,6 +281,8 @@ class TestHarness:
         anthropic_key: Optional[str] = None,
         install_local: bool = False,
         verbose: bool = False,
+        jobs: Optional[int] = None,
+        clean: bool = False,
     ):
         self.examples_dir = examples_dir
         self.sdk_zip = sdk_zip
@@ -69,7 +290,17 @@ class TestHarness:
         self.anthropic_key = anthropic_key
         self.install_local = install_local
         self.verbose = verbose
+        self.jobs = jobs or default_jobs()
+        self.clean = clean
         self.quick_mode = sdk_zip is None
+        self._print_lock = threading.Lock()
+        self._import_errors: Dict[str, Optional[str]] = {}  # category -> error, None if importable
+        self._import_locks: Dict[str, threading.Lock] = {}  # category -> lock held while probing
+        self._import_lock = threading.Lock()  # guards _import_locks
+        # category -> durations of passed tests
+        self.duration_stats: Dict[str, List[float]] = defaultdict(list)
+        self._stats_lock = threading.Lock()
+        self._base_env: Optional[dict] = None
 
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.harness_dir = Path(f"/tmp/macaw-harness-{self.timestamp}")
@@ -77,6 +308,8 @@ class TestHarness:
         self.sdk_dir = self.harness_dir / "sdk"
         self.results_dir = self.harness_dir / "results"
         self.test_cases: List[TestCase] = []
+        self.tests_by_category: Dict[str, List[TestCase]] = defaultdict(list)
+        self.planned_categories: Optional[set] = None  # None until plan() runs
 
         # In quick mode, use current Python interpreter
         if self.quick_mode:
@@ -94,68 +327,72 @@ class TestHarness:
             print(f"Python: {self.python}")
             self.results_dir = Path(f"/tmp/macaw-harness-{self.timestamp}")
             self.results_dir.mkdir(parents=True, exist_ok=True)
+            self._open_results()
             return
 
         print(f"\nHarness directory: {self.harness_dir}")
 
         # Create directories
         self.harness_dir.mkdir(parents=True, exist_ok=True)
-        self.sdk_dir.mkdir(exist_ok=True)
         self.results_dir.mkdir(exist_ok=True)
+        self._open_results()
 
-        # Extract SDK zip
-        print(f"\n1. Extracting SDK from: {self.sdk_zip.name}")
-        with zipfile.ZipFile(self.sdk_zip, 'r') as zf:
-            zf.extractall(self.sdk_dir)
+        # Extract SDK zip, reusing an earlier extraction of the same zip
+        sdk_cache = CACHE_DIR / f"sdk-{file_sha256(self.sdk_zip)[:16]}"
+        sdk_marker = sdk_cache / ".complete"
+        if sdk_marker.exists() and not self.clean:
+            print(f"\n1. Reusing extracted SDK: {sdk_cache}")
+        else:
+            print(f"\n1. Extracting SDK from: {self.sdk_zip.name}")
+            if sdk_cache.exists():
+                shutil.rmtree(sdk_cache)
+            sdk_cache.mkdir(parents=True)
+            extract_zip(self.sdk_zip, sdk_cache, self.jobs)
+            sdk_marker.touch()
+        try:
+            self.sdk_dir.symlink_to(sdk_cache, target_is_directory=True)
+        except OSError:
+            # No symlink privilege (Windows): use the cache directly
+            self.sdk_dir = sdk_cache
+
+        # Collect wheels and .macaw config dirs in a single walk of the SDK tree
+        wheels: List[Path] = []
+        macaw_configs: List[Path] = []
+        for dirpath, dirnames, filenames in os.walk(self.sdk_dir):
+            if ".macaw" in dirnames:
+                macaw_configs.append(Path(dirpath) / ".macaw")
+            wheels.extend(
+                Path(dirpath) / name
+                for name in fnmatch.filter(filenames, "macaw_client-*.whl")
+            )
 
         # Find the wheel file matching current platform
-        wheels = list(self.sdk_dir.rglob("macaw_client-*.whl"))
         if not wheels:
             raise FileNotFoundError(f"No macaw_client wheel found in {self.sdk_zip}")
 
-        # Select wheel matching current Python version and platform
-        py_version = f"cp{sys.version_info.major}{sys.version_info.minor}"
-
-        # Determine platform tag
-        import platform
-        system = platform.system().lower()
-        machine = platform.machine().lower()
-
-        if system == "darwin":
-            if machine == "arm64":
-                platform_tag = "macosx_11_0_arm64"
-            else:
-                platform_tag = "macosx_10_9_x86_64"
-        elif system == "linux":
-            platform_tag = "manylinux_2_17_x86_64"
-        elif system == "windows":
-            platform_tag = "win_amd64"
-        else:
-            platform_tag = None
-
-        # Find matching wheel
-        self.wheel_path = None
+        # Select the wheel whose tags best match this interpreter (the venv is
+        # created from it). sys_tags() is ordered most- to least-preferred.
+        priority = {tag: i for i, tag in enumerate(sys_tags())}
+        best = None
         for wheel in wheels:
-            wheel_name = wheel.name
-            if py_version in wheel_name and (platform_tag is None or platform_tag in wheel_name):
-                self.wheel_path = wheel
-                break
-
-        if not self.wheel_path:
-            # Fall back to any wheel with matching Python version
-            for wheel in wheels:
-                if py_version in wheel.name:
-                    self.wheel_path = wheel
-                    print(f"   Warning: No exact platform match, using: {wheel.name}")
-                    break
-
-        if not self.wheel_path:
-            raise FileNotFoundError(f"No matching wheel found for {py_version} on {platform_tag}")
+            try:
+                _, _, _, wheel_tags = parse_wheel_filename(wheel.name)
+            except InvalidWheelFilename:
+                continue
+            rank = min((priority[t] for t in wheel_tags if t in priority), default=None)
+            if rank is not None and (best is None or rank < best[0]):
+                best = (rank, wheel)
+
+        if best is None:
+            raise FileNotFoundError(
+                f"No wheel compatible with this interpreter ({next(iter(sys_tags()))}) "
+                f"among: {', '.join(w.name for w in wheels)}"
+            )
+        self.wheel_path = best[1]
 
         print(f"   Found wheel: {self.wheel_path.name}")
 
         # Find .macaw config directory
-        macaw_configs = list(self.sdk_dir.rglob(".macaw"))
         if macaw_configs:
             self.macaw_config_dir = macaw_configs[0]
             print(f"   Found config: {self.macaw_config_dir}")
@@ -163,170 +400,192 @@ class TestHarness:
             self.macaw_config_dir = None
             print("   Warning: No .macaw config directory found in SDK")
 
-        # Create virtual environment
-        print(f"\n2. Creating virtual environment...")
-        subprocess.run([sys.executable, "-m", "venv", str(self.venv_dir)], check=True)
-
-        # Get pip path
-        self.pip = self.venv_dir / "bin" / "pip"
-        self.python = self.venv_dir / "bin" / "python"
-
-        # Upgrade pip
-        subprocess.run(
-            [str(self.pip), "install", "--upgrade", "pip"],
-            check=True,
-            capture_output=True,
-        )
-
-        # Install macaw-client from SDK
-        print(f"\n3. Installing macaw-client from SDK...")
-        result = subprocess.run(
-            [str(self.pip), "install", str(self.wheel_path)],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            print(f"   Error: {result.stderr}")
-            raise RuntimeError("Failed to install macaw-client")
-        print(f"   Installed: {self.wheel_path.name}")
-
-        # Install macaw-adapters
-        print(f"\n4. Installing macaw-adapters...")
+        # Resolve what macaw-adapters to install (part of the venv cache key).
+        # MCP-only runs don't need the LLM provider SDKs.
+        extras = "[mcp]" if self.planned_categories == {"mcp"} else "[all]"
+        local_wheel = None
         if self.install_local:
             dist_dir = self.examples_dir.parent / "dist"
             local_wheels = list(dist_dir.glob("macaw_adapters-*.whl"))
             if local_wheels:
-                install_target = str(local_wheels[-1]) + "[all]"
-                print(f"   From local: {local_wheels[-1].name}")
+                local_wheel = local_wheels[-1]
+                install_target = str(local_wheel) + extras
             else:
-                print("   No local wheel found, falling back to PyPI")
-                install_target = "macaw-adapters[all]"
+                install_target = "macaw-adapters" + extras
         else:
-            install_target = "macaw-adapters[all]"
-            print("   From PyPI")
+            install_target = "macaw-adapters" + extras
+
+        # Reuse a venv built earlier from the same interpreter, wheel and target.
+        # The venv symlinks its interpreter, so the key includes its path too.
+        key = hashlib.sha256()
+        key.update(sys.executable.encode())
+        key.update(sys.version.encode())
+        key.update(file_sha256(self.wheel_path).encode())
+        key.update(install_target.encode())
+        if local_wheel:
+            key.update(file_sha256(local_wheel).encode())
+        self.venv_dir = CACHE_DIR / f"venv-{key.hexdigest()[:16]}"
+        complete_marker = self.venv_dir / ".complete"
 
-        result = subprocess.run(
-            [str(self.pip), "install", "--force-reinstall", "--no-cache-dir", install_target],
-            capture_output=True,
-            text=True,
-        )
-        if result.returncode != 0:
-            print(f"   Error: {result.stderr}")
-            raise RuntimeError("Failed to install macaw-adapters")
-        print("   Installed successfully")
+        self.pip = self.venv_dir / "bin" / "pip"
+        self.python = self.venv_dir / "bin" / "python"
+
+        if complete_marker.exists() and not self.clean:
+            print(f"\n2. Reusing cached virtual environment: {self.venv_dir}")
+            print("   (pass --clean to rebuild)")
+        else:
+            self._build_venv(install_target, local_wheel)
+            complete_marker.touch()
 
         # Show API key status
-        print(f"\n5. API Keys:")
+        print(f"\n4. API Keys:")
         print(f"   OpenAI:    {'configured' if self.openai_key else 'not provided'}")
         print(f"   Anthropic: {'configured' if self.anthropic_key else 'not provided'}")
 
         print(f"\nSetup complete!")
         print("=" * 60)
 
+    def _open_results(self):
+        """Create results.txt and write its header; tests are appended as they finish."""
+        self.results_file = self.results_dir / "results.txt"
+        self._results = open(self.results_file, "w")
+        self._results.write(f"MACAW Adapters Test Results\n")
+        self._results.write(f"{'=' * 60}\n")
+        self._results.write(f"Started:   {datetime.now().isoformat()}\n")
+        self._results.write(f"Harness:   {self.harness_dir}\n")
+        sdk = self.sdk_zip.name if self.sdk_zip else "quick mode (current environment)"
+        self._results.write(f"SDK:       {sdk}\n")
+        self._results.write(f"OpenAI:    {'yes' if self.openai_key else 'no'}\n")
+        self._results.write(f"Anthropic: {'yes' if self.anthropic_key else 'no'}\n")
+        self._results.write(f"{'=' * 60}\n\n")
+        self._results.flush()
+
+    def _build_venv(self, install_target: str, local_wheel: Optional[Path]):
+        """Create the virtual environment and install macaw-client + macaw-adapters."""
+        if self.venv_dir.exists():
+            shutil.rmtree(self.venv_dir)
+        self.venv_dir.parent.mkdir(parents=True, exist_ok=True)
+
+        # Create virtual environment
+        print(f"\n2. Creating virtual environment: {self.venv_dir}")
+        # In-process rather than `python -m venv`; symlinking the interpreter
+        # is safe while the source Python stays in place (not on Windows)
+        venv.EnvBuilder(with_pip=True, symlinks=(os.name != "nt")).create(self.venv_dir)
+
+        # Install macaw-client from SDK and macaw-adapters in one pip invocation
+        print(f"\n3. Installing macaw-client and macaw-adapters...")
+        print(f"   macaw-client: {self.wheel_path.name}")
+        if local_wheel:
+            print(f"   macaw-adapters from local: {local_wheel.name}")
+        elif self.install_local:
+            print("   No local wheel found, falling back to PyPI")
+        else:
+            print("   macaw-adapters from PyPI")
+
+        result = self._install_packages([str(self.wheel_path), install_target])
+        if result.returncode != 0:
+            print(f"   Error: {result.stderr}")
+            raise RuntimeError("Failed to install macaw-client / macaw-adapters")
+        print("   Installed successfully")
+
+    def _install_packages(self, packages: List[str]) -> subprocess.CompletedProcess:
+        """
+        Install packages into the venv without a networked pip resolve when possible.
+
+        Uses uv if it is on PATH. Otherwise installs offline from a wheelhouse
+        under CACHE_DIR, downloading into it first when it is missing wheels
+        (or always, with --clean).
+        """
+        uv = shutil.which("uv")
+        if uv:
+            print("   Using uv")
+            fresh = ["--reinstall", "--no-cache"] if self.clean else []
+            return subprocess.run(
+                [uv, "pip", "install", "--python", str(self.python), *fresh, *packages],
+                capture_output=True,
+                text=True,
+            )
+
+        # venv on Python 3.12+ already bundles a recent pip; older ones get upgraded
+        # in the same resolver run as everything else
+        if sys.version_info < (3, 12):
+            packages = ["pip", *packages]
+
+        wheelhouse = CACHE_DIR / "wheelhouse"
+        wheelhouse.mkdir(parents=True, exist_ok=True)
+        quiet = ["--disable-pip-version-check", "--no-input", "--progress-bar", "off"]
+        fresh = ["--force-reinstall"] if self.clean else []
+        install = [
+            str(self.pip), "install", *quiet, *fresh, "--upgrade",
+            "--no-index", "--find-links", str(wheelhouse), *packages,
+        ]
+
+        if not self.clean:
+            result = subprocess.run(install, capture_output=True, text=True)
+            if result.returncode == 0:
+                print("   From wheelhouse cache")
+                return result
+
+        print(f"   Downloading into wheelhouse: {wheelhouse}")
+        result = subprocess.run(
+            [str(self.pip), "download", *quiet, "--dest", str(wheelhouse), *packages],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            return result
+        return subprocess.run(install, capture_output=True, text=True)
+
     def discover_tests(self):
         """Discover all test cases from examples directory."""
         print("\nDiscovering test cases...")
 
-        # Define test configurations
-        test_configs = {
-            # OpenAI examples
-            "openai/openai_1a_dropin_simple.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "openai/openai_1b_multiuser_bind.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "openai/openai_1b_multiuser_bind_streaming.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "openai/openai_1c_a2a_invoke.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            # Anthropic examples
-            "anthropic/anthropic_1a_dropin_simple.py": {
-                "requires_keys": ["ANTHROPIC_API_KEY"],
-            },
-            "anthropic/anthropic_1b_multiuser_bind.py": {
-                "requires_keys": ["ANTHROPIC_API_KEY"],
-            },
-            "anthropic/anthropic_1b_multiuser_bind_streaming.py": {
-                "requires_keys": ["ANTHROPIC_API_KEY"],
-            },
-            "anthropic/anthropic_1c_a2a_invoke.py": {
-                "requires_keys": ["ANTHROPIC_API_KEY"],
-            },
-            # LangChain examples
-            "langchain/langchain_1a_dropin_simple.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "langchain/langchain_1b_multiuser.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "langchain/langchain_1c_orchestration.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "langchain/langchain_1d_llm_openai.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            "langchain/langchain_1e_llm_anthropic.py": {
-                "requires_keys": ["ANTHROPIC_API_KEY"],
-            },
-            "langchain/langchain_1f_memory.py": {
-                "requires_keys": ["OPENAI_API_KEY"],
-            },
-            # MCP examples - server/client pairs
-            "mcp/1a_simple_invocation.py": {
-                "requires_server": "mcp/securemcp_calculator.py",
-                "timeout": 90,
-            },
-            "mcp/1b_discovery_and_resources.py": {
-                "requires_server": "mcp/securemcp_calculator.py",
-                "timeout": 90,
-            },
-            "mcp/1c_logging_client.py": {
-                "requires_server": "mcp/securemcp_calculator.py",
-                "timeout": 90,
-            },
-            "mcp/1d_progress_client.py": {
-                "requires_server": "mcp/securemcp_calculator.py",
-                "timeout": 90,
-            },
-            "mcp/1e_sampling_client.py": {
-                "requires_server": "mcp/1e_sampling_server.py",
-                "timeout": 90,
-            },
-            "mcp/1f_elicitation_client.py": {
-                "requires_server": "mcp/1f_elicitation_server.py",
-                "timeout": 90,
-            },
-            "mcp/1g_roots_client.py": {
-                "requires_server": "mcp/1g_roots_server.py",
-                "timeout": 90,
-            },
-        }
-
-        for script_rel, config in test_configs.items():
-            script_path = self.examples_dir / script_rel
-            if script_path.exists():
-                category = script_rel.split("/")[0]
-                server_path = None
-                if config.get("requires_server"):
-                    server_path = self.examples_dir / config["requires_server"]
-
-                tc = TestCase(
-                    name=script_rel,
-                    script=script_path,
-                    category=category,
-                    requires_server=server_path,
-                    requires_keys=config.get("requires_keys", []),
-                    timeout=config.get("timeout", 60),
-                )
-                self.test_cases.append(tc)
+        # One directory listing per category instead of a stat per script
+        present: Dict[str, set] = {}
+        for config in TEST_CONFIGS:
+            category, _, filename = config.script.partition("/")
+            if category not in present:
+                try:
+                    with os.scandir(self.examples_dir / category) as entries:
+                        present[category] = {e.name for e in entries if e.is_file()}
+                except FileNotFoundError:
+                    present[category] = set()
+            if filename not in present[category]:
+                continue
+
+            server_path = None
+            if config.requires_server:
+                server_path = self.examples_dir / config.requires_server
+
+            tc = TestCase(
+                name=config.script,
+                script=self.examples_dir / config.script,
+                category=category,
+                requires_server=server_path,
+                requires_keys=list(config.requires_keys),
+                app_names=list(config.app_names),
+                timeout=config.timeout,
+            )
+            self.test_cases.append(tc)
+            self.tests_by_category[category].append(tc)
 
         print(f"Found {len(self.test_cases)} test cases:")
         for cat in ["openai", "anthropic", "langchain", "mcp"]:
-            count = len([t for t in self.test_cases if t.category == cat])
-            print(f"  {cat}: {count}")
+            print(f"  {cat}: {len(self.tests_by_category[cat])}")
+
+    def plan(self) -> int:
+        """
+        Work out which discovered tests can run with the available API keys.
+
+        Runs before setup() so that a run where every test would be skipped
+        doesn't pay for SDK extraction and the venv build. Returns the number
+        of runnable tests.
+        """
+        runnable = [t for t in self.test_cases if self._check_keys(t)[0]]
+        self.planned_categories = {t.category for t in runnable}
+        total = len(self.test_cases)
+        print(f"\n{len(runnable)}/{total} tests runnable with the configured API keys")
+        return len(runnable)
 
     def _check_keys(self, test: TestCase) -> tuple[bool, list]:
         """Check if required API keys are available (from args or environment)."""
@@ -339,8 +598,8 @@ class TestHarness:
                 missing.append(key)
         return len(missing) == 0, missing
 
-    def _get_env(self, test: TestCase) -> dict:
-        """Build environment variables for test execution."""
+    def _build_base_env(self) -> dict:
+        """Build the environment shared by every test and server process."""
         env = os.environ.copy()
 
         # Set PYTHONPATH to include examples parent (secureAI)
@@ -358,88 +617,326 @@ class TestHarness:
 
         return env
 
-    def run_test(self, test: TestCase) -> TestCase:
-        """Run a single test case."""
-        print(f"\n  {test.name}")
+    def _get_env(self, name: str) -> dict:
+        """Build environment variables for a test or server process."""
+        # Shared part is built once (after setup() resolved the config dir);
+        # copying a plain dict is much cheaper than os.environ.copy()
+        if self._base_env is None:
+            self._base_env = self._build_base_env()
+
+        # Per-process temp dir so concurrently running tests don't share scratch state
+        tmp_dir = self.results_dir / "tmp" / name.replace("/", "_")
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        return {**self._base_env, "TMPDIR": str(tmp_dir)}
 
-        # Check for required keys
+    def _skip_if_missing_keys(self, test: TestCase) -> bool:
+        """Mark test as SKIP if its API keys are missing. Returns True if skipped."""
         has_keys, missing = self._check_keys(test)
-        if not has_keys:
-            test.result = TestResult.SKIP
-            test.error = f"Missing: {', '.join(missing)}"
-            print(f"    SKIP - {test.error}")
-            return test
+        if has_keys:
+            return False
+        test.result = TestResult.SKIP
+        test.error = f"Missing: {', '.join(missing)}"
+        test.log.append(f"SKIP - {test.error}")
+        return True
+
+    def _import_error(self, category: str) -> Optional[str]:
+        """
+        Check once per category that macaw_adapters.<category> imports in the test env.
+
+        Returns None if it does, otherwise a short error. The result is cached,
+        so a broken install fails every test of the category without spawning it.
+        Only tests of the same category wait on a probe in progress.
+        """
+        with self._import_lock:
+            lock = self._import_locks.setdefault(category, threading.Lock())
+        with lock:
+            if category in self._import_errors:
+                return self._import_errors[category]
+            module = f"macaw_adapters.{category}"
+            try:
+                result = subprocess.run(
+                    [str(self.python), "-c", f"import {module}"],
+                    env=self._get_env(f"probe_{category}"),
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=IMPORT_PROBE_TIMEOUT,
+                )
+                if result.returncode == 0:
+                    error = None
+                else:
+                    lines = result.stderr.decode(errors="replace").strip().splitlines()
+                    reason = lines[-1] if lines else f"exit code {result.returncode}"
+                    error = f"Cannot import {module}: {reason}"
+            except subprocess.TimeoutExpired:
+                error = f"Import of {module} timed out after {IMPORT_PROBE_TIMEOUT}s"
+            self._import_errors[category] = error
+            return error
+
+    def _fail_if_unimportable(self, test: TestCase) -> bool:
+        """Mark test as FAIL if its adapter package can't be imported. Returns True if failed."""
+        error = self._import_error(test.category)
+        if error is None:
+            return False
+        test.result = TestResult.FAIL
+        test.error = error
+        test.log.append(f"FAIL - {error}")
+        return True
+
+    def _start_server(self, server_path: Path) -> subprocess.Popen:
+        """Start an MCP server in its own process group and wait for it to register."""
+        # Server output goes to a log file: an undrained PIPE fills at 64KB and
+        # blocks a chatty server mid-test. The child keeps its own handle.
+        log_path = self.results_dir / f"{server_path.stem}.server.log"
+        with open(log_path, "wb") as server_log:
+            proc = subprocess.Popen(
+                [str(self.python), str(server_path)],
+                env=self._get_env(f"server_{server_path.name}"),
+                stdout=server_log,
+                stderr=subprocess.STDOUT,
+                **NEW_PROCESS_GROUP,
+            )
+        try:
+            self._wait_for_server(proc, log_path)
+        except BaseException:
+            self._stop_process_group(proc)
+            raise
+        return proc
+
+    def _wait_for_server(
+        self, proc: subprocess.Popen, log_path: Path, timeout: float = SERVER_READY_TIMEOUT
+    ) -> bool:
+        """
+        Wait until the server logs a ready line, exits, or timeout elapses.
+
+        Returns True if a ready line was seen. A server that exits is left for
+        the caller to detect via poll(); one that stays alive but silent is
+        treated as ready once timeout elapses (the previous fixed wait).
+        """
+        deadline = time.monotonic() + timeout
+        tail = b""
+        with open(log_path, "rb") as log:
+            while time.monotonic() < deadline:
+                data = log.read()
+                if data:
+                    # Keep a short tail so a marker split across reads still matches
+                    tail = tail[-256:] + data
+                    if SERVER_READY_RE.search(tail):
+                        return True
+                if proc.poll() is not None:
+                    return False
+                time.sleep(0.1)
+        return False
+
+    def _stop_process_group(self, proc: subprocess.Popen):
+        """Terminate a process together with its process group (servers, timed-out tests)."""
+        try:
+            if os.name == "nt":
+                proc.send_signal(signal.CTRL_BREAK_EVENT)
+            else:
+                os.killpg(os.getpgid(proc.pid), signal.SIGTERM)
+            proc.wait(timeout=5)
+        except Exception:
+            try:
+                if os.name == "nt":
+                    proc.kill()
+                else:
+                    os.killpg(os.getpgid(proc.pid), signal.SIGKILL)
+            except Exception:
+                pass
+
+    def _expected_duration(self, category: str) -> Optional[float]:
+        """Median duration of passed tests in category so far, None before the first."""
+        with self._stats_lock:
+            durations = self.duration_stats[category]
+            return statistics.median(durations) if durations else None
+
+    def _run_client(self, test: TestCase, env: dict) -> TestCase:
+        """Run a test script (server, if any, already running) and record the result."""
+        # Once a category has passing tests, a hang is cut off at 5x their median
+        # (at least 10s) instead of waiting out the full configured timeout
+        expected = self._expected_duration(test.category)
+        timeout = test.timeout
+        if expected is not None:
+            timeout = min(test.timeout, max(10, 5 * expected))
 
-        env = self._get_env(test)
         start_time = time.time()
-        server_proc = None
-
-        try:
-            # Start server if needed
-            if test.requires_server:
-                print(f"    Starting server: {test.requires_server.name}")
-                server_proc = subprocess.Popen(
-                    [str(self.python), str(test.requires_server)],
+        # stdout and stderr share one temp file: no pipes to drain, and the
+        # child can never block on a full pipe buffer
+        with tempfile.TemporaryFile() as out:
+            try:
+                proc = subprocess.Popen(
+                    [str(self.python), str(test.script)],
                     env=env,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    preexec_fn=os.setsid,
+                    stdout=out,
+                    stderr=subprocess.STDOUT,
+                    **NEW_PROCESS_GROUP,
                 )
-                time.sleep(10)  # Wait for server to register with control plane
-
-                if server_proc.poll() is not None:
+                try:
+                    returncode = proc.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    # Own process group, so anything the script spawned goes too
+                    self._stop_process_group(proc)
+                    raise
+
+                test.duration = time.time() - start_time
+
+                if returncode == 0:
+                    test.result = TestResult.PASS
+                    test.log.append(f"PASS ({test.duration:.1f}s)")
+                    with self._stats_lock:
+                        self.duration_stats[test.category].append(test.duration)
+                    # Passing output is only ever shown in verbose reports
+                    if self.verbose:
+                        out.seek(0)
+                        test.output = out.read().decode(errors="replace")
+                else:
                     test.result = TestResult.FAIL
-                    test.error = "Server failed to start"
-                    print(f"    FAIL - Server failed to start")
-                    return test
-
-            # Run the test script
-            result = subprocess.run(
-                [str(self.python), str(test.script)],
-                env=env,
-                capture_output=True,
-                timeout=test.timeout,
-            )
+                    # Keep only the tail of a failure's output (the part with the error)
+                    size = out.seek(0, os.SEEK_END)
+                    out.seek(max(0, size - OUTPUT_TAIL_BYTES))
+                    test.error = out.read().decode(errors="replace")
+                    if self.verbose:
+                        out.seek(0)
+                        test.output = out.read().decode(errors="replace")
+                    test.log.append(f"FAIL (exit code {returncode})")
+                    if self.verbose and test.error:
+                        test.log.append(f"output: {test.error[-300:]}")
+
+            except subprocess.TimeoutExpired:
+                test.duration = time.time() - start_time
+                test.result = TestResult.TIMEOUT
+                if timeout < test.timeout:
+                    test.log.append(
+                        f"TIMEOUT - soft timeout after {timeout:.0f}s (expected ~{expected:.1f}s)"
+                    )
+                else:
+                    test.log.append(f"TIMEOUT after {test.timeout}s")
+
+            except Exception as e:
+                test.duration = time.time() - start_time
+                test.result = TestResult.FAIL
+                test.error = str(e)
+                test.log.append(f"FAIL - {e}")
 
-            test.duration = time.time() - start_time
-            test.output = result.stdout.decode()
-            test.error = result.stderr.decode()
+        return test
 
-            if result.returncode == 0:
-                test.result = TestResult.PASS
-                print(f"    PASS ({test.duration:.1f}s)")
+    def run_test(self, test: TestCase) -> TestCase:
+        """Run a single standalone test case (no server)."""
+        if self._skip_if_missing_keys(test) or self._fail_if_unimportable(test):
+            return test
+        return self._run_client(test, self._get_env(test.name))
+
+    def run_server_group(self, server_path: Path, tests: List[TestCase]):
+        """
+        Start server_path once, run each client test against it, then stop it.
+
+        Each test is printed as soon as it finishes.
+        """
+        runnable = []
+        for test in tests:
+            if self._skip_if_missing_keys(test) or self._fail_if_unimportable(test):
+                self._print_result(test)
             else:
-                test.result = TestResult.FAIL
-                print(f"    FAIL (exit code {result.returncode})")
-                if self.verbose:
-                    if test.output:
-                        print(f"    stdout: {test.output[:300]}")
-                    if test.error:
-                        print(f"    stderr: {test.error[:300]}")
-
-        except subprocess.TimeoutExpired:
-            test.duration = time.time() - start_time
-            test.result = TestResult.TIMEOUT
-            print(f"    TIMEOUT after {test.timeout}s")
-
-        except Exception as e:
-            test.duration = time.time() - start_time
-            test.result = TestResult.FAIL
-            test.error = str(e)
-            print(f"    FAIL - {e}")
+                runnable.append(test)
+        if not runnable:
+            return
 
+        runnable[0].log.append(f"Starting server: {server_path.name}")
+        server_proc = None
+        try:
+            try:
+                server_proc = self._start_server(server_path)
+                error = None if server_proc.poll() is None else "Server failed to start"
+            except Exception as e:
+                error = f"Server failed to start: {e}"
+            if error:
+                for test in runnable:
+                    test.result = TestResult.FAIL
+                    test.error = error
+                    test.log.append(f"FAIL - {error}")
+                    self._print_result(test)
+                return
+
+            for test in runnable:
+                self._run_client(test, self._get_env(test.name))
+                self._print_result(test)
         finally:
-            if server_proc:
-                try:
-                    os.killpg(os.getpgid(server_proc.pid), signal.SIGTERM)
-                    server_proc.wait(timeout=5)
-                except Exception:
-                    try:
-                        os.killpg(os.getpgid(server_proc.pid), signal.SIGKILL)
-                    except Exception:
-                        pass
-
-        return test
+            if server_proc is not None:
+                self._stop_process_group(server_proc)
+
+    def _print_result(self, test: TestCase):
+        """Print a finished test's status block in one piece and append it to results.txt."""
+        lines = [f"\n  {test.name}"] + [f"    {line}" for line in test.log]
+        with self._print_lock:
+            print("\n".join(lines), flush=True)
+
+            f = self._results
+            f.write(f"Test: {test.name}\n")
+            f.write(f"Result: {test.result.value}\n")
+            f.write(f"Duration: {test.duration:.1f}s\n")
+            if test.error and test.result != TestResult.PASS:
+                f.write(f"Error: {test.error}\n")
+            f.write("-" * 40 + "\n")
+            if test.output and self.verbose:
+                f.write("Output:\n")
+                f.write(test.output)
+            f.write("\n")
+            # Flushed per test so partial results survive an interrupted run
+            f.flush()
+        # Output lives on in results.txt; don't hold it until the report
+        test.output = ""
+
+    def _shards(self, group_apps: bool = True) -> List[List[TestCase]]:
+        """
+        Group tests into independently runnable shards.
+
+        Tests sharing a server script run sequentially in one shard (the servers
+        register under the same name). With group_apps, tests that register any
+        MACAW app name in common are chained into one shard the same way, so two
+        agents never claim the same name at once. Everything else gets its own
+        shard.
+        """
+        shards: Dict[Any, List[TestCase]] = {}
+        ordered: List[List[TestCase]] = []
+        for category in ["openai", "anthropic", "langchain", "mcp"]:
+            for test in self.tests_by_category[category]:
+                if test.requires_server:
+                    keys: List[Any] = [test.requires_server]
+                elif group_apps:
+                    keys = list(test.app_names)
+                else:
+                    keys = []
+
+                joined = []
+                for key in keys:
+                    shard = shards.get(key)
+                    if shard is not None and not any(shard is j for j in joined):
+                        joined.append(shard)
+                if not joined:
+                    shard = []
+                    ordered.append(shard)
+                else:
+                    # Merge every shard this test links together into the first
+                    shard = joined[0]
+                    for other in joined[1:]:
+                        shard.extend(other)
+                        ordered = [s for s in ordered if s is not other]
+                        for key, value in shards.items():
+                            if value is other:
+                                shards[key] = shard
+                shard.append(test)
+                for key in keys:
+                    shards[key] = shard
+        return ordered
+
+    def _run_shard(self, shard: List[TestCase]):
+        """Run a shard's tests in order, printing each as it finishes."""
+        if shard[0].requires_server:
+            self.run_server_group(shard[0].requires_server, shard)
+            return
+        for test in shard:
+            self.run_test(test)
+            self._print_result(test)
 
     def run_all(self):
         """Run all discovered test cases."""
@@ -447,13 +944,27 @@ class TestHarness:
         print("Running Tests")
         print("=" * 60)
 
-        for category in ["openai", "anthropic", "langchain", "mcp"]:
-            tests = [t for t in self.test_cases if t.category == category]
-            if tests:
-                print(f"\n{category.upper()} ({len(tests)} tests)")
-                print("-" * 40)
-                for test in tests:
-                    self.run_test(test)
+        # Sequential runs never overlap, so only parallel runs need app grouping
+        shards = self._shards(group_apps=self.jobs > 1)
+
+        if self.jobs <= 1:
+            current = None
+            for shard in shards:
+                category = shard[0].category
+                if category != current:
+                    current = category
+                    count = len(self.tests_by_category[category])
+                    print(f"\n{category.upper()} ({count} tests)")
+                    print("-" * 40)
+                self._run_shard(shard)
+            return
+
+        print(f"\n{len(self.test_cases)} tests, {len(shards)} shards, {self.jobs} workers")
+        print("-" * 40)
+        with ThreadPoolExecutor(max_workers=self.jobs) as pool:
+            futures = [pool.submit(self._run_shard, shard) for shard in shards]
+            for future in as_completed(futures):
+                future.result()
 
     def generate_report(self):
         """Generate test results report."""
@@ -462,37 +973,25 @@ class TestHarness:
         print("=" * 60)
 
         # Summary by category
-        categories = {}
-        for test in self.test_cases:
-            if test.category not in categories:
-                categories[test.category] = {"pass": 0, "fail": 0, "skip": 0, "timeout": 0}
-
-            if test.result == TestResult.PASS:
-                categories[test.category]["pass"] += 1
-            elif test.result == TestResult.FAIL:
-                categories[test.category]["fail"] += 1
-            elif test.result == TestResult.SKIP:
-                categories[test.category]["skip"] += 1
-            elif test.result == TestResult.TIMEOUT:
-                categories[test.category]["timeout"] += 1
-
-        for cat, stats in categories.items():
-            total = sum(stats.values())
-            passed = stats['pass']
-            print(f"\n{cat.upper()}: {passed}/{total} passed", end="")
-            if stats['fail']:
-                print(f", {stats['fail']} failed", end="")
-            if stats['skip']:
-                print(f", {stats['skip']} skipped", end="")
-            if stats['timeout']:
-                print(f", {stats['timeout']} timeout", end="")
+        for cat, tests in self.tests_by_category.items():
+            if not tests:
+                continue
+            stats = Counter(test.result for test in tests)
+            print(f"\n{cat.upper()}: {stats[TestResult.PASS]}/{len(tests)} passed", end="")
+            if stats[TestResult.FAIL]:
+                print(f", {stats[TestResult.FAIL]} failed", end="")
+            if stats[TestResult.SKIP]:
+                print(f", {stats[TestResult.SKIP]} skipped", end="")
+            if stats[TestResult.TIMEOUT]:
+                print(f", {stats[TestResult.TIMEOUT]} timeout", end="")
             print()
 
         # Overall
-        total_pass = sum(c["pass"] for c in categories.values())
-        total_fail = sum(c["fail"] for c in categories.values())
-        total_skip = sum(c["skip"] for c in categories.values())
-        total_timeout = sum(c["timeout"] for c in categories.values())
+        totals = Counter(test.result for test in self.test_cases)
+        total_pass = totals[TestResult.PASS]
+        total_fail = totals[TestResult.FAIL]
+        total_skip = totals[TestResult.SKIP]
+        total_timeout = totals[TestResult.TIMEOUT]
         total = len(self.test_cases)
 
         print(f"\n{'=' * 40}")
@@ -504,31 +1003,16 @@ class TestHarness:
         if total_timeout:
             print(f"  Timeout: {total_timeout}")
 
-        # Write detailed results
-        results_file = self.results_dir / "results.txt"
-        with open(results_file, "w") as f:
-            f.write(f"MACAW Adapters Test Results\n")
+        # Per-test blocks were appended as tests finished; close with the totals
+        with self._results as f:
             f.write(f"{'=' * 60}\n")
-            f.write(f"Generated: {datetime.now().isoformat()}\n")
-            f.write(f"Harness:   {self.harness_dir}\n")
-            f.write(f"SDK:       {self.sdk_zip.name if self.sdk_zip else 'quick mode (current environment)'}\n")
-            f.write(f"OpenAI:    {'yes' if self.openai_key else 'no'}\n")
-            f.write(f"Anthropic: {'yes' if self.anthropic_key else 'no'}\n")
-            f.write(f"{'=' * 60}\n\n")
-
-            for test in self.test_cases:
-                f.write(f"Test: {test.name}\n")
-                f.write(f"Result: {test.result.value}\n")
-                f.write(f"Duration: {test.duration:.1f}s\n")
-                if test.error and test.result != TestResult.PASS:
-                    f.write(f"Error: {test.error}\n")
-                f.write("-" * 40 + "\n")
-                if test.output and self.verbose:
-                    f.write("Output:\n")
-                    f.write(test.output)
-                f.write("\n")
-
-        print(f"\nDetailed results: {results_file}")
+            f.write(f"Finished:  {datetime.now().isoformat()}\n")
+            f.write(f"Passed:    {total_pass}/{total}\n")
+            f.write(f"Failed:    {total_fail}\n")
+            f.write(f"Skipped:   {total_skip}\n")
+            f.write(f"Timeout:   {total_timeout}\n")
+
+        print(f"\nDetailed results: {self.results_file}")
         print(f"Harness directory: {self.harness_dir}")
 
 
@@ -573,6 +1057,17 @@ Examples:
         action="store_true",
         help="Install macaw-adapters from local dist/ instead of PyPI",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of tests to run in parallel (default: CPU count - 2; 1 = sequential)",
+    )
+    parser.add_argument(
+        "--clean",
+        action="store_true",
+        help="Re-extract the SDK and rebuild the cached virtual environment from scratch",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -607,11 +1102,16 @@ Examples:
         anthropic_key=args.anthropic_key,
         install_local=args.install_local,
         verbose=args.verbose,
+        jobs=args.jobs,
+        clean=args.clean,
     )
 
     try:
-        harness.setup()
         harness.discover_tests()
+        if not harness.plan():
+            print("Nothing to run: every test needs an API key that isn't configured")
+            sys.exit(0)
+        harness.setup()
         harness.run_all()
         harness.generate_report()
     except KeyboardInterrupt:
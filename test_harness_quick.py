@@ -16,14 +16,20 @@ Prerequisites:
 """
 
 import os
+import re
 import sys
+import atexit
+import multiprocessing
+import runpy
 import subprocess
 import time
 import signal
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Optional, List
+from dataclasses import dataclass, field, replace
+from typing import Optional, List, Dict, Tuple
 from enum import Enum
 
 
@@ -34,91 +40,222 @@ class TestResult(Enum):
     TIMEOUT = "TIMEOUT"
 
 
-@dataclass
+# One result line per test, keyed by outcome
+_STATUS_FORMAT = {
+    TestResult.PASS: "  [PASS] {name} ({duration:.1f}s)",
+    TestResult.SKIP: "  [SKIP] {name} - {error}",
+    TestResult.TIMEOUT: "  [TIME] {name} - {error}",
+    TestResult.FAIL: "  [FAIL] {name} ({duration:.1f}s)",
+}
+
+
+# slots=True needs Python 3.10+; older interpreters get a regular dataclass
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class TestCase:
     name: str
-    script: Path
+    script: str
     category: str
-    requires_server: Optional[Path] = None
+    requires_server: Optional[str] = None
     requires_keys: List[str] = field(default_factory=list)
+    app_name: Optional[str] = None  # MACAW app name the script registers
     timeout: int = 120
     result: TestResult = TestResult.SKIP
-    output: str = ""
     error: str = ""
+    error_raw: bytes = b""  # captured stderr of a failed test, decoded on demand
     duration: float = 0
 
-
-# Quick tests - no IdP required
-QUICK_TESTS = {
+    def error_tail(self, lines: int) -> List[str]:
+        """Last lines of the harness error, or of the test's stderr if it failed on its own."""
+        if self.error:
+            return list(deque(self.error.strip().splitlines(), maxlen=lines))
+        # Only the kept lines of captured stderr get decoded
+        tail = deque(self.error_raw.strip().splitlines(), maxlen=lines)
+        return [line.decode("utf-8", errors="replace") for line in tail]
+
+
+# Output lines that mean an MCP server has registered and is serving
+SERVER_READY_RE = re.compile(
+    rb"Registered as agent|SecureMCP server '[^']*' started|Uvicorn running on|Server running"
+)
+# Upper bound on waiting for a server to register (AWS registration latency)
+SERVER_READY_TIMEOUT = 20.0
+# Time a server gets to exit after SIGTERM (and again after SIGKILL)
+SERVER_STOP_GRACE = 0.5
+# Servers used by a single test; not worth keeping in the server cache
+ONE_OFF_SERVERS = {"1e_sampling_server.py", "1g_roots_server.py"}
+
+# Popen kwargs giving each child its own process group, so killpg() takes
+# down anything it spawned. process_group=0 (3.11+) is a single setpgid()
+# in the child; older Pythons fall back to a new session.
+if sys.version_info >= (3, 11):
+    NEW_PROCESS_GROUP = {"process_group": 0}
+else:
+    NEW_PROCESS_GROUP = {"start_new_session": True}
+
+
+# Imported once by the forkserver so standalone tests start with them loaded
+# (a module that isn't installed is skipped by the forkserver)
+PRELOAD_MODULES = [
+    "macaw_client",
+    "macaw_adapters",
+    "macaw_adapters.openai",
+    "macaw_adapters.anthropic",
+    "macaw_adapters.langchain",
+]
+
+
+def _stem(path: str) -> str:
+    """File name without directory or extension (Path.stem for a str)."""
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def _run_script(script: str, env: dict, stderr_path: str):
+    """
+    Forkserver child: run an example script as __main__, like `python script`.
+
+    stdout is discarded and stderr goes to stderr_path, matching the
+    subprocess path. Exit status comes from SystemExit or an uncaught error.
+    """
+    with open(os.devnull, "wb") as devnull, open(stderr_path, "wb") as err:
+        os.dup2(devnull.fileno(), 1)
+        os.dup2(err.fileno(), 2)
+    os.environ.clear()
+    os.environ.update(env)
+    # What the interpreter would have put on sys.path for `python script`
+    pythonpath = [p for p in env.get("PYTHONPATH", "").split(os.pathsep) if p]
+    sys.path[:0] = [os.path.dirname(script)] + pythonpath
+    sys.argv = [script]
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        # multiprocessing ends children with os._exit(), so the script's atexit
+        # hooks (e.g. client cleanup) would never run. atexit has no public way
+        # to run them: _run_exitfuncs() is what the interpreter itself calls at
+        # shutdown, and has been stable across CPython 3.x. Use it if present;
+        # otherwise the hooks are skipped, as they would be without this.
+        run_exitfuncs = getattr(atexit, "_run_exitfuncs", None)
+        if run_exitfuncs is not None:
+            run_exitfuncs()
+
+
+# Quick tests - no IdP required. Paths are relative to examples/; discover_tests
+# joins them onto the examples dir and copies each template into a fresh
+# TestCase. Paths stay plain strings: subprocess takes them as-is.
+_QUICK_TEST_TEMPLATES: Tuple[TestCase, ...] = (
     # MCP examples - no API keys needed, just MACAW
-    "mcp/1a_simple_invocation.py": {
-        "requires_server": "mcp/securemcp_calculator.py",
-        "timeout": 120,
-    },
-    "mcp/1b_discovery_and_resources.py": {
-        "requires_server": "mcp/securemcp_calculator.py",
-        "timeout": 120,
-    },
-    "mcp/1c_logging_client.py": {
-        "requires_server": "mcp/securemcp_calculator.py",
-        "timeout": 120,
-    },
-    "mcp/1d_progress_client.py": {
-        "requires_server": "mcp/securemcp_calculator.py",
-        "timeout": 120,
-    },
-    "mcp/1e_sampling_client.py": {
-        "requires_server": "mcp/1e_sampling_server.py",
-        "timeout": 120,
-    },
-    "mcp/1g_roots_client.py": {
-        "requires_server": "mcp/1g_roots_server.py",
-        "timeout": 120,
-    },
+    TestCase(
+        name="mcp/1a_simple_invocation.py",
+        script="mcp/1a_simple_invocation.py",
+        category="mcp",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=120,
+    ),
+    TestCase(
+        name="mcp/1b_discovery_and_resources.py",
+        script="mcp/1b_discovery_and_resources.py",
+        category="mcp",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=120,
+    ),
+    TestCase(
+        name="mcp/1c_logging_client.py",
+        script="mcp/1c_logging_client.py",
+        category="mcp",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=120,
+    ),
+    TestCase(
+        name="mcp/1d_progress_client.py",
+        script="mcp/1d_progress_client.py",
+        category="mcp",
+        requires_server="mcp/securemcp_calculator.py",
+        timeout=120,
+    ),
+    TestCase(
+        name="mcp/1e_sampling_client.py",
+        script="mcp/1e_sampling_client.py",
+        category="mcp",
+        requires_server="mcp/1e_sampling_server.py",
+        timeout=120,
+    ),
+    TestCase(
+        name="mcp/1g_roots_client.py",
+        script="mcp/1g_roots_client.py",
+        category="mcp",
+        requires_server="mcp/1g_roots_server.py",
+        timeout=120,
+    ),
     # 1a examples - need API keys but no IdP
-    "openai/openai_1a_dropin_simple.py": {
-        "requires_keys": ["OPENAI_API_KEY"],
-        "timeout": 120,
-    },
-    "anthropic/anthropic_1a_dropin_simple.py": {
-        "requires_keys": ["ANTHROPIC_API_KEY"],
-        "timeout": 120,
-    },
-    "langchain/langchain_1a_dropin_simple.py": {
-        "requires_keys": ["OPENAI_API_KEY"],
-        "timeout": 120,
-    },
-}
+    TestCase(
+        name="openai/openai_1a_dropin_simple.py",
+        script="openai/openai_1a_dropin_simple.py",
+        category="openai",
+        requires_keys=["OPENAI_API_KEY"],
+        app_name="my-simple-app",
+        timeout=120,
+    ),
+    TestCase(
+        name="anthropic/anthropic_1a_dropin_simple.py",
+        script="anthropic/anthropic_1a_dropin_simple.py",
+        category="anthropic",
+        requires_keys=["ANTHROPIC_API_KEY"],
+        app_name="my-simple-app",
+        timeout=120,
+    ),
+    TestCase(
+        name="langchain/langchain_1a_dropin_simple.py",
+        script="langchain/langchain_1a_dropin_simple.py",
+        category="langchain",
+        requires_keys=["OPENAI_API_KEY"],
+        timeout=120,
+    ),
+)
 
 
 class QuickTestHarness:
     def __init__(self, examples_dir: Path, verbose: bool = False):
         self.examples_dir = examples_dir
         self.verbose = verbose
-        self.python = Path(sys.executable)
+        self._python_str: str = sys.executable
         self.timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.results_dir = Path(f"/tmp/macaw-quick-{self.timestamp}")
         self.test_cases: List[TestCase] = []
+        self._server_cache: Dict[str, subprocess.Popen] = {}
+        self._base_env = {**os.environ, "PYTHONPATH": str(self.examples_dir.parent)}
+
+        # Standalone tests fork from a forkserver that has the SDK preloaded,
+        # instead of cold-starting an interpreter each. The forkserver is a
+        # single-threaded process, so this is safe alongside the worker pool.
+        self._forkserver = None
+        if os.name == "posix" and "forkserver" in multiprocessing.get_all_start_methods():
+            self._forkserver = multiprocessing.get_context("forkserver")
+            self._forkserver.set_forkserver_preload(PRELOAD_MODULES)
 
     def discover_tests(self):
         """Discover quick test cases."""
-        for script_rel, config in QUICK_TESTS.items():
-            script_path = self.examples_dir / script_rel
-            if script_path.exists():
-                category = script_rel.split("/")[0]
+        root = str(self.examples_dir)
+        # One directory listing per category instead of a stat per script
+        present: Dict[str, set] = {}
+        for template in _QUICK_TEST_TEMPLATES:
+            category = template.category
+            if category not in present:
+                try:
+                    with os.scandir(os.path.join(root, category)) as entries:
+                        present[category] = {e.name for e in entries if e.is_file()}
+                except FileNotFoundError:
+                    present[category] = set()
+            if template.script.partition("/")[2] in present[category]:
                 server_path = None
-                if config.get("requires_server"):
-                    server_path = self.examples_dir / config["requires_server"]
-
-                tc = TestCase(
-                    name=script_rel,
-                    script=script_path,
-                    category=category,
+                if template.requires_server:
+                    server_path = os.path.join(root, template.requires_server)
+                self.test_cases.append(replace(
+                    template,
+                    script=os.path.join(root, template.script),
                     requires_server=server_path,
-                    requires_keys=config.get("requires_keys", []),
-                    timeout=config.get("timeout", 60),
-                )
-                self.test_cases.append(tc)
+                ))
 
     def _check_keys(self, test: TestCase) -> tuple:
         """Check if required API keys are available."""
@@ -128,19 +265,96 @@ class QuickTestHarness:
                 missing.append(key)
         return len(missing) == 0, missing
 
+    def _skip_if_missing_keys(self, test: TestCase) -> bool:
+        """Mark test as SKIP if its API keys are missing. Returns True if skipped."""
+        has_keys, missing = self._check_keys(test)
+        if has_keys:
+            return False
+        test.result = TestResult.SKIP
+        test.error = f"Missing: {', '.join(missing)}"
+        return True
+
     def _get_env(self, test: TestCase) -> dict:
-        """Build environment variables for test execution."""
-        env = os.environ.copy()
-        env["PYTHONPATH"] = str(self.examples_dir.parent)
-        return env
+        """Environment variables for test execution (no per-test overrides yet)."""
+        # Shared read-only: Popen only reads env to build the child's envp
+        return self._base_env
+
+    def _wait_for_server(
+        self, proc: subprocess.Popen, log_path: Path, timeout: float = SERVER_READY_TIMEOUT
+    ) -> bool:
+        """
+        Wait until the server logs a ready line, exits, or timeout elapses.
+
+        Returns True if a ready line was seen. A server that exits is left for
+        the caller to detect via poll(); one that stays alive but silent is
+        treated as ready once timeout elapses (the previous fixed wait).
+        """
+        deadline = time.monotonic() + timeout
+        tail = b""
+        with open(log_path, "rb") as log:
+            while time.monotonic() < deadline:
+                data = log.read()
+                if data:
+                    # Keep a short tail so a marker split across reads still matches
+                    tail = tail[-256:] + data
+                    if SERVER_READY_RE.search(tail):
+                        return True
+                if proc.poll() is not None:
+                    return False
+                time.sleep(0.05)
+        return False
+
+    def _start_server(self, server_path: str, env: dict) -> subprocess.Popen:
+        """Start an MCP server in its own process group and wait for it to register."""
+        # Server output goes to a log file: nothing drains a PIPE while
+        # the client runs, and a full pipe blocks the server
+        log_path = self.results_dir / f"{_stem(server_path)}.server.log"
+        with open(log_path, "ab") as server_log:
+            proc = subprocess.Popen(
+                [self._python_str, server_path],
+                env=env,
+                stdout=server_log,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                **NEW_PROCESS_GROUP,
+            )
+        self._wait_for_server(proc, log_path)
+        return proc
+
+    def _stop_server(self, proc: subprocess.Popen):
+        """Terminate a server's process group, escalating to SIGKILL after a short grace."""
+        # The server leads its own process group (NEW_PROCESS_GROUP), so its
+        # pid is the pgid; no getpgid() lookup that races with reaping
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(proc.pid, sig)
+            except ProcessLookupError:
+                pass  # group already gone
+            try:
+                proc.wait(timeout=SERVER_STOP_GRACE)
+                return
+            except subprocess.TimeoutExpired:
+                continue
+
+    def _get_server(self, server_path: str, env: dict) -> subprocess.Popen:
+        """Return a running server for server_path, reusing a cached one if still alive."""
+        if os.path.basename(server_path) in ONE_OFF_SERVERS:
+            return self._start_server(server_path, env)
+        proc = self._server_cache.get(server_path)
+        if proc is None or proc.poll() is not None:
+            proc = self._start_server(server_path, env)
+            self._server_cache[server_path] = proc
+        return proc
+
+    def shutdown_servers(self):
+        """Stop every cached server."""
+        for proc in self._server_cache.values():
+            self._stop_server(proc)
+        self._server_cache.clear()
 
     def run_test(self, test: TestCase) -> TestCase:
         """Run a single test case."""
-        # Check for required keys
-        has_keys, missing = self._check_keys(test)
-        if not has_keys:
-            test.result = TestResult.SKIP
-            test.error = f"Missing: {', '.join(missing)}"
+        if self._skip_if_missing_keys(test):
             return test
 
         env = self._get_env(test)
@@ -148,38 +362,38 @@ class QuickTestHarness:
         server_proc = None
 
         try:
-            # Start server if required
-            if test.requires_server and test.requires_server.exists():
-                server_proc = subprocess.Popen(
-                    [str(self.python), str(test.requires_server)],
-                    env=env,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    preexec_fn=os.setsid,
-                )
-                time.sleep(20)  # Wait for server to register (AWS registration latency)
+            # Start server if required (cached servers stay up for the next client)
+            if test.requires_server and os.path.exists(test.requires_server):
+                server_proc = self._get_server(test.requires_server, env)
 
                 if server_proc.poll() is not None:
                     test.result = TestResult.FAIL
                     test.error = "Server failed to start"
                     return test
 
-            # Run the test
-            result = subprocess.run(
-                [str(self.python), str(test.script)],
-                env=env,
-                capture_output=True,
-                timeout=test.timeout,
-            )
+            # Run the test; stdout is never reported, only a failure's stderr.
+            # Clients of a server stay separate processes.
+            if server_proc is None and self._forkserver is not None:
+                returncode, stderr = self._run_forked(test, env)
+            else:
+                result = subprocess.run(
+                    [self._python_str, test.script],
+                    env=env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=test.timeout,
+                    **NEW_PROCESS_GROUP,
+                )
+                returncode, stderr = result.returncode, result.stderr
 
             test.duration = time.time() - start_time
-            test.output = result.stdout.decode("utf-8", errors="replace")
-            test.error = result.stderr.decode("utf-8", errors="replace")
 
-            if result.returncode == 0:
+            if returncode == 0:
                 test.result = TestResult.PASS
             else:
                 test.result = TestResult.FAIL
+                test.error_raw = stderr
 
         except subprocess.TimeoutExpired:
             test.result = TestResult.TIMEOUT
@@ -192,73 +406,138 @@ class QuickTestHarness:
             test.duration = time.time() - start_time
 
         finally:
-            # Cleanup server
-            if server_proc:
-                try:
-                    os.killpg(os.getpgid(server_proc.pid), signal.SIGTERM)
-                    server_proc.wait(timeout=5)
-                except Exception:
-                    try:
-                        os.killpg(os.getpgid(server_proc.pid), signal.SIGKILL)
-                    except Exception:
-                        pass
+            # Cleanup one-off server; cached ones go in shutdown_servers()
+            if server_proc and server_proc is not self._server_cache.get(test.requires_server):
+                self._stop_server(server_proc)
 
         return test
 
+    def _run_forked(self, test: TestCase, env: dict) -> Tuple[int, bytes]:
+        """
+        Run a standalone test in a child of the preloaded forkserver.
+
+        Returns (exit code, stderr). Raises subprocess.TimeoutExpired like
+        subprocess.run() if the test outlives its timeout.
+        """
+        stderr_path = self.results_dir / f"{_stem(test.script)}.stderr"
+        proc = self._forkserver.Process(
+            target=_run_script, args=(test.script, env, str(stderr_path))
+        )
+        proc.start()
+        proc.join(test.timeout)
+        if proc.exitcode is None:
+            proc.terminate()
+            proc.join(SERVER_STOP_GRACE)
+            if proc.exitcode is None:
+                proc.kill()
+                proc.join()
+            raise subprocess.TimeoutExpired(test.script, test.timeout)
+        stderr = b""
+        if proc.exitcode != 0 and stderr_path.exists():
+            stderr = stderr_path.read_bytes()
+        return proc.exitcode, stderr
+
+    def _shards(self) -> List[List[TestCase]]:
+        """
+        Group tests into shards that can run concurrently.
+
+        Tests sharing a server script stay in one shard and run in order (two
+        copies of a server would register under the same name), as do tests
+        registering the same app name; every other test is a shard of its own.
+        Tests missing API keys are marked SKIP here and never reach a worker.
+
+        Shards come out network-bound LLM tests first, then longest timeout
+        first, so their latency overlaps MCP server startup in the pool.
+        """
+        shards: Dict[str, List[TestCase]] = {}
+        ordered: List[List[TestCase]] = []
+        by_priority = sorted(
+            self.test_cases, key=lambda t: (0 if t.requires_keys else 1, -t.timeout)
+        )
+        for test in by_priority:
+            if self._skip_if_missing_keys(test):
+                continue
+            key = test.requires_server or test.app_name
+            if key:
+                if key not in shards:
+                    shards[key] = []
+                    ordered.append(shards[key])
+                shards[key].append(test)
+            else:
+                ordered.append([test])
+        return ordered
+
+    def _run_shard(self, shard: List[TestCase]):
+        """Run a shard's tests one after another."""
+        for test in shard:
+            self.run_test(test)
+
     def run_all(self):
-        """Run all test cases."""
+        """Run all test cases, then print results grouped by category."""
         self.results_dir.mkdir(parents=True, exist_ok=True)
 
+        # Tests are I/O bound (servers, LLM calls), so threads are enough
+        shards = self._shards()
+        try:
+            with ThreadPoolExecutor(max_workers=min(8, len(shards) or 1)) as pool:
+                list(pool.map(self._run_shard, shards))
+        finally:
+            self.shutdown_servers()
+
+        by_category: Dict[str, List[TestCase]] = defaultdict(list)
+        for test in self.test_cases:
+            by_category[test.category].append(test)
+
         for category in ["mcp", "openai", "anthropic", "langchain"]:
-            category_tests = [t for t in self.test_cases if t.category == category]
+            category_tests = by_category[category]
             if not category_tests:
                 continue
 
-            print(f"\n{category.upper()} ({len(category_tests)} tests)")
-            print("-" * 40)
-
+            # One write per category block
+            buf = [f"\n{category.upper()} ({len(category_tests)} tests)", "-" * 40]
             for test in category_tests:
-                self.run_test(test)
-                status = test.result.value
-                if test.result == TestResult.PASS:
-                    print(f"  [PASS] {test.name} ({test.duration:.1f}s)")
-                elif test.result == TestResult.SKIP:
-                    print(f"  [SKIP] {test.name} - {test.error}")
-                elif test.result == TestResult.TIMEOUT:
-                    print(f"  [TIME] {test.name} - {test.error}")
-                else:
-                    print(f"  [FAIL] {test.name} ({test.duration:.1f}s)")
-                    if self.verbose and test.error:
-                        for line in test.error.strip().split("\n")[-5:]:
-                            print(f"         {line}")
+                buf.append(_STATUS_FORMAT[test.result].format(
+                    name=test.name, duration=test.duration, error=test.error
+                ))
+                if self.verbose and test.result == TestResult.FAIL:
+                    buf.extend(f"         {line}" for line in test.error_tail(5))
+            sys.stdout.write("\n".join(buf) + "\n")
+        sys.stdout.flush()
 
     def print_summary(self):
         """Print test summary."""
-        passed = len([t for t in self.test_cases if t.result == TestResult.PASS])
-        failed = len([t for t in self.test_cases if t.result == TestResult.FAIL])
-        skipped = len([t for t in self.test_cases if t.result == TestResult.SKIP])
-        timeout = len([t for t in self.test_cases if t.result == TestResult.TIMEOUT])
+        counts = Counter(t.result for t in self.test_cases)
+        passed = counts[TestResult.PASS]
+        failed = counts[TestResult.FAIL]
+        skipped = counts[TestResult.SKIP]
+        timeout = counts[TestResult.TIMEOUT]
         total = len(self.test_cases)
 
-        print("\n" + "=" * 60)
-        print("QUICK TEST SUMMARY")
-        print("=" * 60)
-        print(f"  Passed:  {passed}/{total}")
-        print(f"  Failed:  {failed}")
-        print(f"  Skipped: {skipped}")
-        print(f"  Timeout: {timeout}")
-        print("=" * 60)
+        buf = [
+            "\n" + "=" * 60,
+            "QUICK TEST SUMMARY",
+            "=" * 60,
+            f"  Passed:  {passed}/{total}",
+            f"  Failed:  {failed}",
+            f"  Skipped: {skipped}",
+            f"  Timeout: {timeout}",
+            "=" * 60,
+        ]
 
         if skipped > 0:
-            print("\nSkipped tests need API keys:")
-            print("  export OPENAI_API_KEY=sk-...")
-            print("  export ANTHROPIC_API_KEY=sk-ant-...")
+            buf.append("\nSkipped tests need API keys:")
+            buf.append("  export OPENAI_API_KEY=sk-...")
+            buf.append("  export ANTHROPIC_API_KEY=sk-ant-...")
 
         if failed > 0 or timeout > 0:
-            print("\nFor full output, run with --verbose")
+            buf.append("\nFor full output, run with --verbose")
+
+        buf.append("\nFor multi-user examples (requires IdP), run:")
+        buf.append("  python test_harness.py")
 
-        print(f"\nFor multi-user examples (requires IdP), run:")
-        print(f"  python test_harness.py")
+        # Built up front and written once
+        sys.stdout.write("\n".join(buf) + "\n")
+        sys.stdout.flush()
 
 
 def main():